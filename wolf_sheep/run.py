@@ -1,3 +1,3 @@
-from wolf_sheep.server import server
+from wolf_sheep.server import make_server
 
-server.launch(open_browser=True)
+make_server().launch(open_browser=True)
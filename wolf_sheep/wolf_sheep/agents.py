@@ -1,8 +1,8 @@
 import mesa
-import random
 import decimal
 
 from .random_walk import RandomWalker
+from . import events
 
 class Deer(RandomWalker):
     """
@@ -29,7 +29,7 @@ class Deer(RandomWalker):
     
         living = True
                  
-        self.random_move(coordinates)       #Random move out of all possible movements
+        self.random_move(coordinates, self.model.streams.random("movement"))       #Random move out of all possible movements
         self.energy -= int(1345/4)          #Lose energy for their movement   
         
         
@@ -50,7 +50,7 @@ class Deer(RandomWalker):
         #Calculate food taken out of food pool and assigned to any deer
         if self.model.deer_food_pool > 0 and treelist != []:          
             tenper = int(self.model.deer_required_energy * 0.1)
-            gain = self.model.random.randrange(self.model.deer_required_energy - tenper, self.model.deer_required_energy + tenper)
+            gain = self.model.streams.random("feeding").randrange(self.model.deer_required_energy - tenper, self.model.deer_required_energy + tenper)
             
             # Deer cant have over 50% excess energy (1.5*1345)
             if self.energy >= 1345:         
@@ -66,6 +66,8 @@ class Deer(RandomWalker):
         
         # Death if energy = 0
         if self.energy < 0:
+            if self.model.event_log is not None:
+                self.model.event_log.record(self.model.schedule.steps, events.DEER_ENERGY_DEATH, self.pos, self.unique_id)
             self.model.grid.remove_agent(self)
             self.model.schedule.remove(self)
             living = False
@@ -73,8 +75,9 @@ class Deer(RandomWalker):
          
          
         #Have a chance at reproduction if requirements met
+        reproduction = self.model.streams.random("reproduction")
         if self.reproducible:
-            if living and self.random.random() < self.model.deer_reproduce:
+            if living and reproduction.random() < self.model.deer_reproduce:
                 if([self.pos] != [None]):
                     neighbor_cells = self.model.grid.get_neighborhood(self.pos, True)
                     emptycells = []
@@ -84,14 +87,16 @@ class Deer(RandomWalker):
                             emptycells.append(i)
 
                     if emptycells != []:
-                        place = random.choice(emptycells)
+                        place = reproduction.choice(emptycells)
                         fawnEnergy = self.energy / 2
                         fawn = Deer(self.model.next_id(), place, self.model, self.moore, True, False, fawnEnergy)
                         self.model.grid.place_agent(fawn, place)
+                        if self.model.event_log is not None:
+                            self.model.event_log.record(self.model.schedule.steps, events.DEER_BIRTH, place, fawn.unique_id, self.unique_id)
                         self.model.schedule.add(fawn)   
                         
                 #75% chance a deer producing a second deer if already giving birth
-                if self.random.random() < 0.75:
+                if reproduction.random() < 0.75:
                     if([self.pos] != [None]):
                         neighbor_cells = self.model.grid.get_neighborhood(self.pos, True)
                         emptycells = []
@@ -100,28 +105,37 @@ class Deer(RandomWalker):
                                 emptycells.append(i)
 
                         if emptycells != []:
-                            place = random.choice(emptycells)
+                            place = reproduction.choice(emptycells)
                             fawnEnergy = self.energy / 2
                             fawn = Deer(self.model.next_id(), place, self.model, self.moore, True, False, fawnEnergy)
                             self.model.grid.place_agent(fawn, place)
+                            if self.model.event_log is not None:
+                                self.model.event_log.record(self.model.schedule.steps, events.DEER_BIRTH, place, fawn.unique_id, self.unique_id)
                             self.model.schedule.add(fawn)
        
         #Chance of dying due to deer mortality rate
-        if (not self.fawn and living and self.random.random() < self.model.deer_mortality):
+        mortality = self.model.streams.random("deer_mortality")
+        if (not self.fawn and living and mortality.random() < self.model.deer_mortality):
+                if self.model.event_log is not None:
+                    self.model.event_log.record(self.model.schedule.steps, events.DEER_MORTALITY_DEATH, self.pos, self.unique_id)
                 self.model.grid.remove_agent(self)
                 self.model.schedule.remove(self)
                 living = False
                 self.model.deer_mortality_death_count +=1
                 
         #Chance of dying due to fawn mortality rate
-        if (self.fawn and living and self.random.random() < self.model.fawn_mortality):
+        if (self.fawn and living and mortality.random() < self.model.fawn_mortality):
+                if self.model.event_log is not None:
+                    self.model.event_log.record(self.model.schedule.steps, events.FAWN_MORTALITY_DEATH, self.pos, self.unique_id)
                 self.model.grid.remove_agent(self)
                 self.model.schedule.remove(self)
                 living = False
                 self.model.fawn_mortality_death_count +=1
 
         #Chance of dying due to population control
-        if living and self.random.random() < self.model.population_control:
+        if living and mortality.random() < self.model.population_control:
+                if self.model.event_log is not None:
+                    self.model.event_log.record(self.model.schedule.steps, events.DEER_POPULATION_CONTROL_DEATH, self.pos, self.unique_id)
                 self.model.grid.remove_agent(self)
                 self.model.schedule.remove(self)
                 living = False
@@ -156,6 +170,8 @@ class TreePatch(mesa.Agent):
             if self.countdown <= 0:
                 self.fully_grown = True
                 self.has_grown = True
+                if self.model.event_log is not None:
+                    self.model.event_log.record(self.model.schedule.steps, events.TREE_MATURED, self.pos, self.unique_id)
                 self.countdown = self.model.tree_regrowth_time  
         #Pass will allow the tree to gain no health and will thus die at the end of the step
             elif self.health == 0:
@@ -171,7 +187,9 @@ class TreePatch(mesa.Agent):
             self.model.schedule.remove(self)
                         
         # Tree Natural Death due to mortality
-        elif (self.random.random() < self.model.tree_natural_mortality):
+        elif (self.model.streams.random("tree_mortality").random() < self.model.tree_natural_mortality):
+            if self.model.event_log is not None:
+                self.model.event_log.record(self.model.schedule.steps, events.TREE_NATURAL_DEATH, self.pos, self.unique_id)
             self.model.grid.remove_agent(self)
             self.model.schedule.remove(self)
             self.model.tree_natural_death_count += 1
@@ -0,0 +1,95 @@
+"""
+Startup-time check for sweep workers and the command line.
+
+Imports each module in a fresh interpreter, as a spawned worker would, and
+reports the import time and the total process time. Fails if a module goes
+over its time budget or pulls in a module it should not need. To run it,
+cd into the directory containing run.py and run
+``python -m wolf_sheep.check_startup``.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+#Fresh process budgets in seconds, including interpreter startup. Set about
+#1.5 times above measured times (cohort 0.10-0.15s, the others 0.50-0.77s)
+#so that a regression of that size is caught
+BUDGETS = {
+    "wolf_sheep.cohort": 0.25,
+    "wolf_sheep.model": 1.2,
+    "wolf_sheep.store": 1.2,
+    "wolf_sheep.server": 1.2,
+}
+
+#Modules that must not be loaded when importing each module.
+#
+#The model core should not need the visualisation or web server, but
+#mesa/__init__.py (mesa 2.4) imports mesa.visualization, which imports
+#tornado, and WolfDeer subclasses mesa.Model, so wolf_sheep.model and
+#wolf_sheep.store still fail on those two entries. They are kept so the
+#check keeps reporting it until mesa stops importing them.
+FORBIDDEN = {
+    "wolf_sheep.cohort": ["mesa", "wolf_sheep.model", "wolf_sheep.server"],
+    "wolf_sheep.model": ["wolf_sheep.server", "mesa.visualization", "tornado"],
+    "wolf_sheep.store": ["wolf_sheep.server", "mesa.visualization", "tornado"],
+    "wolf_sheep.server": [],
+}
+
+REPEATS = 3
+
+#Directory containing the wolf_sheep package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - start)\n"
+    "print(' '.join(sys.modules))\n"
+)
+
+
+def measure(module):
+    """
+    Returns the best import time, the best total process time and the modules
+    loaded, over REPEATS fresh interpreters.
+    """
+    import_time = process_time = None
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", CODE.format(module=module)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        )
+        elapsed = time.perf_counter() - start
+        lines = result.stdout.splitlines()
+        if import_time is None or float(lines[0]) < import_time:
+            import_time = float(lines[0])
+        if process_time is None or elapsed < process_time:
+            process_time = elapsed
+    return import_time, process_time, set(lines[1].split())
+
+
+def check():
+    """
+    Measures every module in BUDGETS and returns a list of failures.
+    """
+    failures = []
+    for module, budget in BUDGETS.items():
+        import_time, process_time, loaded = measure(module)
+        print("%-20s import %.3fs  process %.3fs  (budget %.2fs)" % (module, import_time, process_time, budget))
+        if process_time > budget:
+            failures.append("%s took %.3fs, over its %.2fs budget" % (module, process_time, budget))
+        for name in FORBIDDEN[module]:
+            if name in loaded:
+                failures.append("%s imports %s" % (module, name))
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check()
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,335 @@
+"""
+Cohort-aggregated version of the Deer-Tree Grazing model for scenario screening.
+
+Deer relocate uniformly and grazing and fraying pick trees uniformly from the
+whole grid, so tree positions do not affect the dynamics. Here juvenile trees
+are kept as counts and health totals per age cohort (days left until fully
+grown), grown trees as two counts, and deer as NumPy arrays. Growth, grazing,
+fraying and mortality are applied to whole cohorts, so a 731 step scenario
+runs in a fraction of a second. Summaries can be compared with WolfDeer using ensemble().
+"""
+
+import math
+
+import numpy as np
+
+from .rng import RandomStreams
+
+#Initial tree allocation, as in WolfDeer
+INITIAL_GROWN_TREES = 11550
+INITIAL_JUVENILE_TREES = 25000
+
+#Energy a deer loses each step and its energy cap for eating, as in Deer.step
+DEER_STEP_COST = int(1345 / 4)
+DEER_ENERGY_CAP = 1345
+
+
+def tree_health(days_alive):
+    """
+    Health of a juvenile tree that has been growing for the given number of days.
+    """
+    return np.round(18.267 * 1.0063198 ** np.asarray(days_alive, dtype=float) * 10)
+
+
+class CohortModel:
+    """
+    Deer-Tree Grazing model with trees aggregated into age cohorts.
+
+    Takes the same parameters as WolfDeer and produces the same DataCollector
+    series (in model_vars) and summary().
+
+    Example:
+    >>> model = CohortModel(tree=True, initial_deer=10, seed=1)
+    >>> model.run_model()
+    >>> model.summary()["grown_trees"]
+    """
+
+    def __init__(
+        self,
+        width=406,
+        height=406,
+        initial_deer=5,
+        deer_reproduce=0.004505,
+        deer_mortality=0.0002189,
+        fawn_mortality=0.0009576,
+        population_control=0.0006839,
+        tree_natural_mortality=0.00002052,
+        tree=False,
+        tree_regrowth_time=731,
+        deer_required_energy=1345,
+        initial_patch=36550,
+        deer_food_pool=5 * 1345,
+        tree_total_health=5 * 1345,
+        seed=None,
+        streams=None,
+    ):
+        """
+        Create a new cohort model. Arguments are the same as for WolfDeer;
+        width, height and initial_patch are accepted but do not change the run.
+
+        Args:
+            seed: Integer seed the random streams are derived from, None for a random run
+            streams: RandomStreams to use instead of seed, e.g. one of RandomStreams.spawn
+        """
+        self.width = width
+        self.height = height
+        self.initial_deer = initial_deer
+        self.deer_reproduce = deer_reproduce
+        self.deer_mortality = deer_mortality
+        self.fawn_mortality = fawn_mortality
+        self.population_control = population_control
+        self.tree_natural_mortality = tree_natural_mortality
+        self.tree = tree
+        self.tree_regrowth_time = tree_regrowth_time
+        self.deer_required_energy = deer_required_energy
+        self.initial_patch = initial_patch
+        self.deer_food_pool = deer_food_pool
+        self.tree_total_health = tree_total_health
+
+        self.streams = streams if streams is not None else RandomStreams(seed)
+        self.steps = 0
+        self.running = True
+
+        #Tree death type counters
+        self.tree_natural_death_count = 0
+        self.tree_antler_death_count = 0
+        self.tree_eaten_death_count = 0
+
+        #Deer death type counters
+        self.deer_population_control_death_count = 0
+        self.deer_energy_death_count = 0
+        self.fawn_mortality_death_count = 0
+        self.deer_mortality_death_count = 0
+
+        landscape = self.streams.generator("landscape")
+
+        #Juvenile cohorts indexed by countdown, with the summed health of their trees
+        self.juvenile_count = np.zeros(self.tree_regrowth_time + 1, dtype=np.int64)
+        self.juvenile_health = np.zeros(self.tree_regrowth_time + 1)
+        #Trees grown at the start, and trees that grew during the run (which can be frayed)
+        self.grown_count = 0
+        self.has_grown_count = 0
+
+        if self.tree:
+            countdowns = landscape.integers(365, self.tree_regrowth_time, INITIAL_JUVENILE_TREES)
+            self.juvenile_count += np.bincount(countdowns, minlength=self.tree_regrowth_time + 1)
+            self.juvenile_health = self.juvenile_count * tree_health(731 - np.arange(self.tree_regrowth_time + 1))
+            self.grown_count = INITIAL_GROWN_TREES
+
+        self.deer_energy = landscape.integers(0, 2 * self.deer_required_energy, self.initial_deer).astype(float)
+        self.deer_fawn = np.zeros(self.initial_deer, dtype=bool)
+
+        #Health gained by a juvenile moving from countdown c to c - 1
+        days = 731 - np.arange(self.tree_regrowth_time + 1) + 1
+        self.growth = np.round((18.267 * 1.0063198 ** days - 18.267 * 1.0063198 ** (days - 1.0)) * 10)
+
+        #Same series as the WolfDeer DataCollector
+        self.model_reporters = {
+            "Deer": lambda m: len(m.deer_energy),
+            "Fully Grown Trees": lambda m: m.grown_count + m.has_grown_count,
+            "Juvenile Trees": lambda m: int(m.juvenile_count.sum()),
+            "Trees Total": lambda m: m.grown_count + m.has_grown_count + int(m.juvenile_count.sum()),
+            "Other Death": lambda m: m.tree_natural_death_count,
+            "Antler Damage": lambda m: m.tree_antler_death_count,
+            "Deer Grazing": lambda m: m.tree_eaten_death_count,
+            "Population Control": lambda m: m.deer_population_control_death_count,
+            "No Energy": lambda m: m.deer_energy_death_count,
+            "Fawn Mortality": lambda m: m.fawn_mortality_death_count,
+            "Deer Mortality": lambda m: m.deer_mortality_death_count,
+        }
+        self.model_vars = {name: [] for name in self.model_reporters}
+        self.collect()
+
+    def collect(self):
+        for name, reporter in self.model_reporters.items():
+            self.model_vars[name].append(reporter(self))
+
+    def step(self):
+        if self.steps == 730:
+            self.running = False
+            return
+
+        deer = len(self.deer_energy)
+        self.deer_food_pool = deer * self.deer_required_energy
+        self.tree_total_health = deer * self.deer_required_energy
+
+        self.graze()
+
+        #No more available food if there is no trees left
+        if self.juvenile_count.sum() == 0:
+            self.deer_required_energy = 0
+            self.deer_food_pool = 0
+        elif (self.steps >= 59 and self.steps <= 242) or (self.steps >= 425 and self.steps <= 608):
+            self.fray()
+
+        self.grow_trees()
+        self.step_deer()
+
+        self.steps += 1
+        self.collect()
+
+    def graze(self):
+        """
+        Remove the grazing health budget from juvenile cohorts, in batches of bites.
+
+        A bite is uniform on [0, deer_required_energy) and kills a tree whose
+        health it exceeds, using the cohort mean health for every tree in it.
+        """
+        rng = self.streams.generator("grazing")
+        energy = self.deer_required_energy
+        other_food_percent = rng.integers(9, 11) / 100
+        budget = self.tree_total_health * (1 - other_food_percent)
+
+        while budget > 0 and energy > 0:
+            count = self.juvenile_count
+            total = count.sum()
+            if total == 0:
+                break
+            mean = np.divide(self.juvenile_health, count, out=np.zeros(len(count)), where=count > 0)
+            kill = np.clip((energy - mean) / energy, 0, 1)
+            partial = np.minimum(mean, energy) / 2
+            per_bite = (count * (kill * mean + (1 - kill) * partial)).sum() / total
+            if per_bite <= 0:
+                break
+
+            bites = rng.multinomial(math.ceil(budget / per_bite), count / total)
+            kills = np.minimum(rng.binomial(bites, kill), count)
+            eaten = kills * mean + (bites - kills) * partial
+
+            self.juvenile_count = count - kills
+            self.juvenile_health = np.maximum(self.juvenile_health - eaten, 0)
+            self.tree_eaten_death_count += int(kills.sum())
+            budget -= eaten.sum()
+
+    def fray(self):
+        """
+        Kill trees through antler fraying, chosen uniformly from juveniles and
+        trees that grew during the run.
+        """
+        adults = int((~self.deer_fawn).sum())
+        antler_deaths = int(round(((3.3 * adults) * (0.15 + 0.0222 * adults)), 0))
+        self.tree_antler_death_count += antler_deaths
+
+        colors = np.append(self.juvenile_count, self.has_grown_count)
+        frayed = self.streams.generator("fraying").multivariate_hypergeometric(colors, min(antler_deaths, colors.sum()))
+        self.remove_juveniles(frayed[:-1])
+        self.has_grown_count -= int(frayed[-1])
+
+    def grow_trees(self):
+        """
+        Age juvenile cohorts by one day, then apply natural tree mortality.
+        """
+        count = self.juvenile_count
+        health = self.juvenile_health
+
+        self.has_grown_count += int(count[0])
+        self.juvenile_count = np.append(count[1:], 0)
+        self.juvenile_health = np.append(health[1:] + count[1:] * self.growth[1:], 0)
+
+        rng = self.streams.generator("tree_mortality")
+        rate = self.tree_natural_mortality
+        deaths = rng.binomial(self.juvenile_count, rate)
+        grown_deaths = rng.binomial(self.grown_count, rate)
+        has_grown_deaths = rng.binomial(self.has_grown_count, rate)
+        self.remove_juveniles(deaths)
+        self.grown_count -= int(grown_deaths)
+        self.has_grown_count -= int(has_grown_deaths)
+        self.tree_natural_death_count += int(deaths.sum() + grown_deaths + has_grown_deaths)
+
+    def remove_juveniles(self, removed):
+        count = self.juvenile_count
+        mean = np.divide(self.juvenile_health, count, out=np.zeros(len(count)), where=count > 0)
+        self.juvenile_count = count - removed
+        self.juvenile_health = self.juvenile_health - removed * mean
+
+    def step_deer(self):
+        """
+        Vectorised Deer.step for every deer: move, eat, die of hunger, reproduce
+        and die of mortality or population control.
+        """
+        energy = self.deer_energy - DEER_STEP_COST
+        fawn = self.deer_fawn
+        n = len(energy)
+        reproducible = (self.steps >= 90 and self.steps <= 180) or (self.steps >= 456 and self.steps <= 546)
+
+        #Deer eat from the food pool in activation order until it runs out
+        if self.deer_food_pool > 0 and self.juvenile_count.sum() > 0:
+            tenper = int(self.deer_required_energy * 0.1)
+            gain = self.streams.generator("feeding").integers(
+                self.deer_required_energy - tenper, self.deer_required_energy + tenper, n
+            ).astype(float)
+            gain[energy >= DEER_ENERGY_CAP] = 0
+            order = self.streams.generator("scheduling").permutation(n)
+            ordered = gain[order]
+            before = np.cumsum(ordered) - ordered
+            taken = np.clip(self.deer_food_pool - before, 0, ordered)
+            energy[order] += taken
+            self.deer_food_pool -= taken.sum()
+
+        living = energy >= 0
+        self.deer_energy_death_count += int(n - living.sum())
+
+        reproduction = self.streams.generator("reproduction")
+        first = living & reproducible & (reproduction.random(n) < self.deer_reproduce)
+        second = first & (reproduction.random(n) < 0.75)
+        fawn_energy = np.concatenate([energy[first], energy[second]]) / 2
+
+        mortality = self.streams.generator("deer_mortality")
+        adult_death = living & ~fawn & (mortality.random(n) < self.deer_mortality)
+        self.deer_mortality_death_count += int(adult_death.sum())
+        living &= ~adult_death
+        fawn_death = living & fawn & (mortality.random(n) < self.fawn_mortality)
+        self.fawn_mortality_death_count += int(fawn_death.sum())
+        living &= ~fawn_death
+        control_death = living & (mortality.random(n) < self.population_control)
+        self.deer_population_control_death_count += int(control_death.sum())
+        living &= ~control_death
+
+        self.deer_energy = np.concatenate([energy[living], fawn_energy])
+        self.deer_fawn = np.concatenate([fawn[living], np.ones(len(fawn_energy), dtype=bool)])
+
+    #Final counts of the run, matching WolfDeer.summary
+    def summary(self):
+        return {
+            "deer": len(self.deer_energy),
+            "grown_trees": self.grown_count + self.has_grown_count,
+            "juvenile_trees": int(self.juvenile_count.sum()),
+            "tree_natural_deaths": self.tree_natural_death_count,
+            "tree_antler_deaths": self.tree_antler_death_count,
+            "tree_eaten_deaths": self.tree_eaten_death_count,
+            "population_control_deaths": self.deer_population_control_death_count,
+            "deer_energy_deaths": self.deer_energy_death_count,
+            "fawn_mortality_deaths": self.fawn_mortality_death_count,
+            "deer_mortality_deaths": self.deer_mortality_death_count,
+        }
+
+    def run_model(self, step_count=731):
+        for i in range(step_count):
+            if not self.running:
+                break
+            self.step()
+
+
+def ensemble(model_class, seeds, step_count=731, **params):
+    """
+    Mean and standard deviation of each summary value over one run per seed.
+
+    Works with both CohortModel and WolfDeer, so a scenario can be screened
+    with the cohort model and checked against the agent model.
+
+    Example:
+    >>> fast = ensemble(CohortModel, range(200), tree=True)
+    >>> full = ensemble(WolfDeer, range(10), tree=True)
+    """
+    runs = []
+    for seed in seeds:
+        model = model_class(seed=seed, **params)
+        for i in range(step_count):
+            if not model.running:
+                break
+            model.step()
+        runs.append(model.summary())
+    return {
+        name: (float(np.mean([run[name] for run in runs])), float(np.std([run[name] for run in runs])))
+        for name in runs[0]
+    }
@@ -0,0 +1,30 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+from .agents import TreePatch
+from .model import WolfDeer
+
+
+@pytest.fixture
+def planted_model(tmp_path, monkeypatch):
+    """
+    Factory for small deer models with hand-placed juvenile trees, since the
+    full tree landscape is too slow to build in tests. Runs in tmp_path so the
+    Results.txt written by the model stays out of the source tree.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def make(trees=200, size=30, health=1500, **params):
+        model = WolfDeer(tree=False, width=size, height=size, **params)
+        landscape = model.streams.random("landscape")
+        for i in range(trees):
+            pos = (landscape.randrange(size), landscape.randrange(size))
+            tree = TreePatch(model.next_id(), pos, model, True, False, False, False, landscape.randrange(1, 200), health)
+            model.grid.place_agent(tree, pos)
+            model.schedule.add(tree)
+        return model
+
+    return make
@@ -0,0 +1,118 @@
+"""
+Compact binary trace of tree and deer events.
+
+Events are packed into fixed-width records in an in-memory buffer and
+appended to a file in chunks. The file can be memory-mapped afterwards and
+read back as a NumPy structured array.
+"""
+
+import struct
+
+import numpy as np
+
+#Event types
+TREE_EATEN = 1
+TREE_FRAYED = 2
+TREE_NATURAL_DEATH = 3
+TREE_MATURED = 4
+DEER_BIRTH = 5
+DEER_ENERGY_DEATH = 6
+DEER_MORTALITY_DEATH = 7
+FAWN_MORTALITY_DEATH = 8
+DEER_POPULATION_CONTROL_DEATH = 9
+
+EVENT_NAMES = {
+    TREE_EATEN: "Tree Eaten",
+    TREE_FRAYED: "Tree Frayed",
+    TREE_NATURAL_DEATH: "Tree Natural Death",
+    TREE_MATURED: "Tree Matured",
+    DEER_BIRTH: "Deer Birth",
+    DEER_ENERGY_DEATH: "Deer Energy Death",
+    DEER_MORTALITY_DEATH: "Deer Mortality Death",
+    FAWN_MORTALITY_DEATH: "Fawn Mortality Death",
+    DEER_POPULATION_CONTROL_DEATH: "Population Control Death",
+}
+
+#File header, followed by the fixed-width records
+MAGIC = b"DTEVENT1"
+
+#step, event type, x, y, agent id, related id (parent of a fawn, otherwise -1)
+RECORD = struct.Struct("<IBhhqq")
+EVENT_DTYPE = np.dtype(
+    [
+        ("step", "<u4"),
+        ("kind", "u1"),
+        ("x", "<i2"),
+        ("y", "<i2"),
+        ("agent_id", "<i8"),
+        ("related_id", "<i8"),
+    ]
+)
+
+
+class EventLog:
+    """
+    Append-only event recorder passed to WolfDeer through its event_log argument.
+
+    Example:
+    >>> with EventLog("events.bin") as log:
+    ...     model = WolfDeer(tree=True, event_log=log)
+    ...     model.run_model()
+    >>> events = read_events("events.bin")
+    >>> events[events["kind"] == TREE_FRAYED]["step"]
+    """
+
+    def __init__(self, path, chunk_events=65536):
+        """
+        Args:
+            path: File the events are written to, replaced if it exists
+            chunk_events: Number of events buffered before they are written out
+        """
+        self.path = path
+        self.chunk_events = chunk_events
+        self.buffer = bytearray(chunk_events * RECORD.size)
+        self.count = 0
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+
+    def record(self, step, kind, pos, agent_id, related_id=-1):
+        """
+        Adds one event to the buffer, writing the buffer out when it is full.
+        """
+        RECORD.pack_into(self.buffer, self.count * RECORD.size, step, kind, pos[0], pos[1], agent_id, related_id)
+        self.count += 1
+        if self.count == self.chunk_events:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered events to the file.
+        """
+        if self.count:
+            self.file.write(memoryview(self.buffer)[: self.count * RECORD.size])
+            self.count = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_events(path):
+    """
+    Memory-maps an event file as a structured array with one row per event.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(path + " is not an event log")
+        #An empty log cannot be memory-mapped
+        if f.read(1) == b"":
+            return np.empty(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode="r", offset=len(MAGIC))
@@ -13,6 +13,8 @@ import mesa
 import decimal
 
 from .agents import TreePatch, Deer
+from . import events
+from .rng import RandomStreams
 from .scheduler import RandomActivationByTypeFiltered
 
 class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
@@ -68,7 +70,11 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
         deer_required_energy=1345,
         initial_patch=36550,
         deer_food_pool = initial_deer * deer_required_energy,
-        tree_total_health = initial_deer * deer_required_energy
+        tree_total_health = initial_deer * deer_required_energy,
+        seed=None,
+        streams=None,
+        event_log=None,
+        profiler=None
     ):
         """
         Create a new Deer-Tree Grazing model with the given parameters.
@@ -86,10 +92,19 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
             deer_required_energy: Average deer food requirement per time step
             deer_food_pool: Deer daily collective food pool based on deer food requirements
             tree_total_health: Tree daily collective health pool based on deer food requirements
+            seed: Integer seed the independent random streams of each subsystem are derived from, None for a random run
+            streams: RandomStreams to use instead of seed, e.g. one of RandomStreams.spawn for a parallel worker
+            event_log: Optional EventLog recording tree and deer events
+            profiler: Optional MemoryProfiler sampling memory use during the run
             
             
         """
         super().__init__()
+        
+        #Separate random streams per subsystem, agent activation order uses the scheduling stream
+        self.streams = streams if streams is not None else RandomStreams(seed)
+        self.random = self.streams.random("scheduling")
+        landscape = self.streams.random("landscape")
         self.width = width
         self.height = height
         self.initial_deer = initial_deer
@@ -104,6 +119,9 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
         self.initial_patch = initial_patch
         self.deer_food_pool = deer_food_pool
         self.tree_total_health = tree_total_health
+        self.event_log = event_log
+        self.profiler = profiler
+        self.closed = False
         
         #Collection of data for tracking and visualisations
         self.schedule = RandomActivationByTypeFiltered(self)
@@ -150,11 +168,11 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                 
                 #Find a suitable spot to place the tree
                 while placed == False:
-                    x = self.random.randrange(self.width)
-                    y = self.random.randrange(self.height)
+                    x = landscape.randrange(self.width)
+                    y = landscape.randrange(self.height)
                     while self.grid[x][y] != []:
-                        x = self.random.randrange(self.width)
-                        y = self.random.randrange(self.height)
+                        x = landscape.randrange(self.width)
+                        y = landscape.randrange(self.height)
                         
                     blocks = self.grid.get_neighborhood((x, y), True)
 
@@ -174,7 +192,7 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                 fully_grown = False
                   
                 #Assigned tree health and regrowth time       
-                countdown = self.random.randrange(365, self.tree_regrowth_time)
+                countdown = landscape.randrange(365, self.tree_regrowth_time)
                 daysAlive = 731 - countdown
                 health = round(decimal.Decimal((decimal.Decimal(18.267) * decimal.Decimal(1.0063198**(daysAlive)))) *10, 0)
                 
@@ -188,11 +206,11 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                 placed = False
                 
                 while placed == False:
-                    x = self.random.randrange(self.width)
-                    y = self.random.randrange(self.height)
+                    x = landscape.randrange(self.width)
+                    y = landscape.randrange(self.height)
                     while self.grid[x][y] != []:
-                        x = self.random.randrange(self.width)
-                        y = self.random.randrange(self.height)
+                        x = landscape.randrange(self.width)
+                        y = landscape.randrange(self.height)
                         
                     blocks = self.grid.get_neighborhood((x, y), True)
 
@@ -210,18 +228,23 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
         
         # Create deer and place randomly amongst the grid
         for i in range(self.initial_deer):
-            x = self.random.randrange(self.width)
-            y = self.random.randrange(self.height)
-            energy = self.random.randrange(2*self.deer_required_energy)
+            x = landscape.randrange(self.width)
+            y = landscape.randrange(self.height)
+            energy = landscape.randrange(2*self.deer_required_energy)
             deer = Deer(self.next_id(), (x, y), self, True, False, False, energy)
             self.grid.place_agent(deer, (x, y))
             self.schedule.add(deer)   
 
         self.running = True
         self.datacollector.collect(self)
+        if self.profiler is not None:
+            self.profiler.sample(self, "setup")
 
     def step(self):
         
+        if self.profiler is not None and self.schedule.steps > 0 and self.schedule.steps % self.profiler.interval == 0:
+            self.profiler.sample(self, "step " + str(self.schedule.steps))
+        
         #Summary created for the run to collect results
         
         if (self.schedule.steps) == 0:
@@ -234,6 +257,7 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                 "Initial deer food req: " + str(self.deer_required_energy) + "\n" +
                 "Dimensions: " + str(self.height)+"x"+str(self.width) + "\n" + "\n"
             )
+            f.close()
         
         if (self.schedule.steps) == 730:     
             f = open("Results.txt", "a")
@@ -251,7 +275,9 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                     "Deer Mortality Death: " + str(self.deer_mortality_death_count)             
             )
             f.close()
-            exit()
+            self.close()
+            self.running = False
+            return
         
         #Ensure food pool is a regularly updated value based on current amount of deers
         self.deer_food_pool =  self.schedule.get_type_count(Deer) * self.deer_required_energy
@@ -275,17 +301,22 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                     if x.health > 0:
                         treelist2.append(x)
 
+        grazing = self.streams.random("grazing")
+        
         #Deer food gain from additional sources removed from tree health 
-        other_food_percent = self.random.randrange(9, 11)/100 
+        other_food_percent = grazing.randrange(9, 11)/100 
         other_food_source = self.tree_total_health * other_food_percent
         self.tree_total_health -= decimal.Decimal(other_food_source)
         
         #While energy pool still available, select random trees to lose health due to being eaten
         while self.tree_total_health > 0 and treelist != []:
-            eaten = self.random.randrange(self.deer_required_energy)
-            self.random.shuffle(treelist)
+            eaten = grazing.randrange(self.deer_required_energy)
+            grazing.shuffle(treelist)
             #Tree death due to being eaten
             if eaten > treelist[0].health:
+                    #Trees removed in earlier steps can still be listed, they are not recorded again
+                    if self.event_log is not None and treelist[0].pos is not None:
+                        self.event_log.record(self.schedule.steps, events.TREE_EATEN, treelist[0].pos, treelist[0].unique_id)
                     self.tree_total_health -= treelist[0].health
                     treelist[0].health = 0
                     self.tree_eaten_death_count += 1  
@@ -304,9 +335,12 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                 #Tree death due to being frayed
                 antler_deaths = int(round(((3.3 * self.schedule.get_type_count(Deer, lambda x: not x.fawn)) * (0.15 + 0.0222 * self.schedule.get_type_count(Deer, lambda x: not x.fawn))), 0))
                 self.tree_antler_death_count += antler_deaths
-                self.random.shuffle(treelist2)
+                self.streams.random("fraying").shuffle(treelist2)
                 if len(treelist2)>0:  
                     for i in range(antler_deaths):
+                        #Trees already killed, by grazing this step or earlier, are not recorded again
+                        if self.event_log is not None and treelist2[i].pos is not None and treelist2[i].health > 0:
+                            self.event_log.record(self.schedule.steps, events.TREE_FRAYED, treelist2[i].pos, treelist2[i].unique_id)
                         treelist2[i].health = 0         
                         treelist2.remove(treelist2[0])
 
@@ -323,6 +357,32 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                 ]
             )
         
+    #Final counts of the run, matching the Results.txt summary
+    def summary(self):
+        return {
+            "deer": self.schedule.get_type_count(Deer),
+            "grown_trees": self.schedule.get_type_count(TreePatch, lambda x: x.fully_grown),
+            "juvenile_trees": self.schedule.get_type_count(TreePatch, lambda x: not x.fully_grown),
+            "tree_natural_deaths": self.tree_natural_death_count,
+            "tree_antler_deaths": self.tree_antler_death_count,
+            "tree_eaten_deaths": self.tree_eaten_death_count,
+            "population_control_deaths": self.deer_population_control_death_count,
+            "deer_energy_deaths": self.deer_energy_death_count,
+            "fawn_mortality_deaths": self.fawn_mortality_death_count,
+            "deer_mortality_deaths": self.deer_mortality_death_count,
+        }
+
+    #End of the run: flush the event log and take the profiler teardown sample.
+    #Called at step 730 and by run_model, call it after stepping a model by hand.
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.event_log is not None:
+            self.event_log.flush()
+        if self.profiler is not None:
+            self.profiler.sample(self, "teardown")
+
     #Run the model
     def run_model(self, step_count=731):
         if self.verbose:
@@ -335,8 +395,11 @@ class WolfDeer(mesa.Model): #Name retained as WolfDeer due to server connection
                 self.schedule.get_type_count(TreePatch, lambda x: not x.fully_grown))
 
         for i in range(step_count):
+            if not self.running:
+                break
             print(i)
             self.step()
+        self.close()
 
         if self.verbose:
             print("")
@@ -0,0 +1,206 @@
+"""
+Opt-in memory profiling for long runs and batch workers.
+
+A MemoryProfiler passed to WolfDeer samples tracemalloc snapshots and live
+object counts at a fixed step interval and when the run finishes, and
+reports the top allocation sites and growth between samples. check_baseline
+checks that repeatedly building and running models in one process returns
+to a stable amount of traced memory.
+"""
+
+import array
+import gc
+import tracemalloc
+
+from . import model
+from .agents import Deer, TreePatch
+
+#Allocations made by tracemalloc and the import system are not of interest
+IGNORED_FILES = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def results_file_filters():
+    """
+    Filters for the lines where WolfDeer opens Results.txt.
+
+    Each text-mode open() leaves about 67 bytes in a bounded interpreter cache,
+    for up to about 100 calls in a process, which would otherwise look like a
+    steady leak of every run.
+    """
+    with open(model.__file__) as f:
+        return [
+            tracemalloc.Filter(False, model.__file__, lineno)
+            for lineno, line in enumerate(f, 1)
+            if 'open("Results.txt"' in line
+        ]
+
+
+def traced_size(ignore):
+    """
+    Traced memory in bytes, leaving out IGNORED_FILES and the given filters.
+    """
+    snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED_FILES + ignore)
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def live_counts(model):
+    """
+    Counts TreePatch and Deer objects alive in the process, the ones still in
+    the model schedule, and the rows held by the model's DataCollector.
+
+    Live agents that are no longer scheduled are waiting to be garbage collected
+    or are being kept alive by a reference somewhere.
+    """
+    counts = {"TreePatch": 0, "Deer": 0}
+    for obj in gc.get_objects():
+        if isinstance(obj, TreePatch):
+            counts["TreePatch"] += 1
+        elif isinstance(obj, Deer):
+            counts["Deer"] += 1
+    counts["Scheduled TreePatch"] = model.schedule.get_type_count(TreePatch)
+    counts["Scheduled Deer"] = model.schedule.get_type_count(Deer)
+    counts["DataCollector rows"] = max((len(v) for v in model.datacollector.model_vars.values()), default=0)
+    return counts
+
+
+class MemoryProfiler:
+    """
+    Samples memory use of a WolfDeer run, passed through its profiler argument.
+    The teardown sample is taken by WolfDeer.close(), which runs at the end of
+    run_model and at step 730; call it yourself after stepping a model by hand.
+
+    Tracing starts when the profiler is created, so create it before the model
+    to include the cost of building the landscape.
+
+    Example:
+    >>> profiler = MemoryProfiler(interval=50)
+    >>> model = WolfDeer(tree=True, profiler=profiler)
+    >>> model.run_model(100)
+    >>> print(profiler.report())
+    >>> profiler.stop()
+    """
+
+    def __init__(self, interval=100, top=10, key_type="lineno", frames=1):
+        """
+        Args:
+            interval: Number of steps between samples
+            top: Number of allocation sites listed per sample in the report
+            key_type: How allocations are grouped, "lineno", "filename" or "traceback"
+            frames: Number of stack frames stored per allocation
+        """
+        self.interval = interval
+        self.top = top
+        self.key_type = key_type
+        self.samples = []
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(frames)
+
+    def sample(self, model, phase):
+        """
+        Records a snapshot, the traced memory and the live object counts.
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED_FILES)
+        current, peak = tracemalloc.get_traced_memory()
+        self.samples.append(
+            {
+                "phase": phase,
+                "step": model.schedule.steps,
+                "current": current,
+                "peak": peak,
+                "counts": live_counts(model),
+                "snapshot": snapshot,
+            }
+        )
+
+    def report(self):
+        """
+        Text report with the growth and top allocation sites of each sample
+        compared to the one before it.
+        """
+        lines = []
+        previous = None
+        for sample in self.samples:
+            lines.append(
+                "%s (step %d): %.1f KiB traced, %.1f KiB peak"
+                % (sample["phase"], sample["step"], sample["current"] / 1024, sample["peak"] / 1024)
+            )
+            for name, count in sample["counts"].items():
+                if previous is None:
+                    lines.append("    %s: %d" % (name, count))
+                else:
+                    lines.append("    %s: %d (%+d)" % (name, count, count - previous["counts"][name]))
+
+            if previous is None:
+                stats = sample["snapshot"].statistics(self.key_type)
+            else:
+                stats = sample["snapshot"].compare_to(previous["snapshot"], self.key_type)
+            for stat in stats[: self.top]:
+                lines.append("    " + str(stat))
+            previous = sample
+        return "\n".join(lines)
+
+    def stop(self):
+        """
+        Stops tracing if this profiler started it.
+        """
+        if self.started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def check_baseline(make_model, runs=5, step_count=10, tolerance=0.01, allowance=64, warmup=1, ignore=None):
+    """
+    Builds, runs and closes a model several times in this process and measures
+    the traced memory left over after each run, leaving out allocations matched
+    by ignore (a list of tracemalloc filters, results_file_filters() by default).
+
+    The first warmup runs are not judged, since they include one-off allocations
+    such as caches. Memory is stable if it does not grow by more than allowance
+    bytes on every run after the warm-up, and the total growth after the warm-up
+    stays within tolerance times the peak memory of one model. Returns the
+    memory after each run and whether it was stable.
+
+    Other bounded caches that grow for a while can be looked past with a larger
+    warmup, or left out with ignore.
+
+    Example:
+    >>> memory, stable = check_baseline(lambda: WolfDeer(tree=False, seed=1))
+    """
+    if ignore is None:
+        ignore = results_file_filters()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    #Preallocated so that storing the results does not itself grow memory
+    memory = array.array("q", [0] * runs)
+    model_size = 0
+    for i in range(runs):
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        model = make_model()
+        for step in range(step_count):
+            if not model.running:
+                break
+            model.step()
+        if hasattr(model, "close"):
+            model.close()
+        model_size = max(model_size, tracemalloc.get_traced_memory()[1] - before)
+        del model
+        gc.collect()
+        memory[i] = traced_size(ignore)
+
+    if started_tracing:
+        tracemalloc.stop()
+
+    memory = memory.tolist()
+    judged = memory[warmup:]
+    growth = [judged[i + 1] - judged[i] for i in range(len(judged) - 1)]
+    steady_growth = len(growth) > 0 and all(g > allowance for g in growth)
+    drift = len(judged) > 1 and judged[-1] - judged[0] > tolerance * model_size
+    return memory, not steady_growth and not drift
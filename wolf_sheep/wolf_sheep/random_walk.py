@@ -30,10 +30,14 @@ class RandomWalker(mesa.Agent):
         self.pos = pos
         self.moore = moore
 
-    def random_move(self, moves):
+    def random_move(self, moves, rng=None):
         """
         Step one cell in any allowable direction.
+
+        rng: Random stream used to pick the move, defaults to the model's.
         """
         if moves != []:
-            next_move = self.random.choice(moves)
+            if rng is None:
+                rng = self.random
+            next_move = rng.choice(moves)
             self.model.grid.move_agent(self, next_move)  
\ No newline at end of file
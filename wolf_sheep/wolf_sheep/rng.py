@@ -0,0 +1,91 @@
+"""
+Independent random number streams for each model subsystem.
+
+Every subsystem draws from its own stream derived from the model seed, so
+changing how one part of the model uses randomness (batching, vectorizing,
+reordering agents) leaves the draws of every other part unchanged.
+"""
+
+import random
+import zlib
+
+import numpy as np
+
+#Streams used by WolfDeer and its agents
+SUBSYSTEMS = [
+    "landscape",        #Initial tree and deer placement, initial deer energy
+    "grazing",          #Tree health lost to grazing in the model step
+    "feeding",          #Energy gained by each deer from the food pool
+    "fraying",          #Trees killed by antler fraying
+    "tree_mortality",   #Tree natural death
+    "movement",         #Deer relocation
+    "reproduction",     #Deer births and fawn placement
+    "deer_mortality",   #Deer, fawn and population control deaths
+    "scheduling",       #Agent activation order
+]
+
+
+class RandomStreams:
+    """
+    A set of named random streams derived from one seed.
+
+    Each name is mapped to its own child of a numpy SeedSequence, keyed on a
+    checksum of the name, so a stream only depends on the seed and its name.
+    Both a random.Random and a counter-based numpy Generator (Philox) are
+    available for each stream.
+
+    Example:
+    >>> streams = RandomStreams(42)
+    >>> streams.random("grazing").random()
+    >>> streams.generator("grazing").random(10)
+    >>> workers = streams.spawn(4)
+    >>> model = WolfDeer(tree=True, streams=workers[0])
+    """
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed: Integer seed or numpy SeedSequence, None for fresh entropy
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        #Entropy and spawn key actually used. Together they recreate these streams,
+        #with RandomStreams(np.random.SeedSequence(seed, spawn_key=spawn_key))
+        self.seed = self.seed_sequence.entropy
+        self.spawn_key = self.seed_sequence.spawn_key
+        self._randoms = {}
+        self._generators = {}
+
+    def _child(self, name):
+        key = zlib.crc32(name.encode())
+        return np.random.SeedSequence(
+            self.seed_sequence.entropy,
+            spawn_key=self.seed_sequence.spawn_key + (key,),
+        )
+
+    def random(self, name):
+        """
+        Returns the random.Random stream for a subsystem.
+        """
+        stream = self._randoms.get(name)
+        if stream is None:
+            state = self._child(name).generate_state(4, np.uint64)
+            stream = self._randoms[name] = random.Random(state.tobytes())
+        return stream
+
+    def generator(self, name):
+        """
+        Returns the numpy Generator stream for a subsystem.
+        """
+        stream = self._generators.get(name)
+        if stream is None:
+            stream = self._generators[name] = np.random.Generator(np.random.Philox(self._child(name)))
+        return stream
+
+    def spawn(self, n):
+        """
+        Returns n independent sets of streams, e.g. one per parallel worker.
+        """
+        return [RandomStreams(child) for child in self.seed_sequence.spawn(n)]
@@ -31,46 +31,48 @@ def deer_tree(agent):
 
     return portrayal
 
-# Graphing for visualisations
-canvas_element = mesa.visualization.CanvasGrid(deer_tree, 406, 406, 10150, 10150)
-treeChart = mesa.visualization.ChartModule(
-    [
-        {"Label": "Deer", "Color": "#966919"},     
-    ]
-)
-deerChart = mesa.visualization.ChartModule(
-    [
-        {"Label": "Fully Grown Trees", "Color": "#00AA00"},
-        {"Label": "Juvenile Trees", "Color": "#FF0000"}, 
-        {"Label": "Trees Total", "Color": "#000000"}, 
+# Graphing for visualisations, built only when the server is made
+def make_elements():
+    canvas_element = mesa.visualization.CanvasGrid(deer_tree, 406, 406, 10150, 10150)
+    treeChart = mesa.visualization.ChartModule(
+        [
+            {"Label": "Deer", "Color": "#966919"},     
+        ]
+    )
+    deerChart = mesa.visualization.ChartModule(
+        [
+            {"Label": "Fully Grown Trees", "Color": "#00AA00"},
+            {"Label": "Juvenile Trees", "Color": "#FF0000"}, 
+            {"Label": "Trees Total", "Color": "#000000"}, 
              
-    ]
-)
-Treetype = mesa.visualization.BarChartModule(
-    [
-        {"Label": "Fully Grown Trees", "Color": "#00AA00"},
-        {"Label": "Juvenile Trees", "Color": "#FF0000"}, 
-        {"Label": "Trees Total", "Color": "#000000"},
-    ]
+        ]
+    )
+    Treetype = mesa.visualization.BarChartModule(
+        [
+            {"Label": "Fully Grown Trees", "Color": "#00AA00"},
+            {"Label": "Juvenile Trees", "Color": "#FF0000"}, 
+            {"Label": "Trees Total", "Color": "#000000"},
+        ]
     
-)
+    )
 
-TreeDeath = mesa.visualization.BarChartModule(
-    [   
-        {"Label": "Other Death", "Color": "#00AA00"},
-        {"Label": "Antler Damage", "Color": "#FF0000"}, 
-        {"Label": "Deer Grazing", "Color": "#000000"},
-    ]
-)
+    TreeDeath = mesa.visualization.BarChartModule(
+        [   
+            {"Label": "Other Death", "Color": "#00AA00"},
+            {"Label": "Antler Damage", "Color": "#FF0000"}, 
+            {"Label": "Deer Grazing", "Color": "#000000"},
+        ]
+    )
 
-DeerDeath = mesa.visualization.BarChartModule(
-    [   
-        {"Label": "Population Control", "Color": "#A55453"},
-        {"Label": "No Energy", "Color": "#53A59A"}, 
-        {"Label": "Fawn Mortality", "Color": "#B6983D"},
-        {"Label": "Deer Mortality", "Color": "#8BAB6A"},
-    ]
-)  
+    DeerDeath = mesa.visualization.BarChartModule(
+        [   
+            {"Label": "Population Control", "Color": "#A55453"},
+            {"Label": "No Energy", "Color": "#53A59A"}, 
+            {"Label": "Fawn Mortality", "Color": "#B6983D"},
+            {"Label": "Deer Mortality", "Color": "#8BAB6A"},
+        ]
+    )
+    return [canvas_element, treeChart, deerChart, Treetype, TreeDeath, DeerDeath]
 
 
 model_params = {
@@ -87,8 +89,26 @@ model_params = {
     "tree_natural_mortality":mesa.visualization.Slider("Tree Mortality Rate", 0.00002052, 0.00000001, 1.0, 0.00000001),
 }
 
-server = mesa.visualization.ModularServer(
-    WolfDeer, [canvas_element, treeChart, deerChart, Treetype, TreeDeath, DeerDeath], "Deer-Tree Grazing", model_params
-)
-server.port = 8521
+def make_server():
+    """
+    Builds the visualisation server. ModularServer creates a model as soon as it
+    is constructed, so this is only done when the server is actually launched.
+    """
+    server = mesa.visualization.ModularServer(
+        WolfDeer, make_elements(), "Deer-Tree Grazing", model_params
+    )
+    server.port = 8521
+    return server
 
+
+_server = None
+
+
+def __getattr__(name):
+    #Keeps `from wolf_sheep.server import server` working, built on first use
+    global _server
+    if name == "server":
+        if _server is None:
+            _server = make_server()
+        return _server
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
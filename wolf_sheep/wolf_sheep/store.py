@@ -0,0 +1,217 @@
+"""
+Local result store for repeated model runs.
+
+Runs are keyed by a hash of the full WolfDeer parameter set, the seed, the
+step count and the model code version, so identical configurations (and
+overlapping sweep points) are loaded from disk instead of being recomputed.
+"""
+
+import hashlib
+import inspect
+import json
+import numbers
+import os
+import time
+import zipfile
+
+import mesa
+import numpy as np
+
+from .model import WolfDeer
+
+#Modules whose source defines the model behaviour and therefore the cache key
+CORE_MODULES = ["model.py", "agents.py", "scheduler.py", "random_walk.py", "rng.py"]
+
+#Arguments that do not change the result of a run
+UNKEYED_PARAMETERS = ["seed", "streams", "event_log", "profiler"]
+
+#Age after which a temporary file is taken to be left over by a crashed worker
+STALE_TEMP_SECONDS = 3600
+
+#Prefix used to keep summary values apart from DataCollector series in the file
+SUMMARY_PREFIX = "summary:"
+
+
+def code_version():
+    """
+    Hash of the model source files and the mesa version.
+    """
+    digest = hashlib.sha256(mesa.__version__.encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in CORE_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def model_parameters(params):
+    """
+    Full WolfDeer parameter set, with defaults filled in for anything not given.
+    """
+    signature = inspect.signature(WolfDeer.__init__)
+    bound = signature.bind(None, **params)
+    bound.apply_defaults()
+    full = dict(bound.arguments)
+    del full["self"]
+    for name in UNKEYED_PARAMETERS:
+        full.pop(name, None)
+
+    #Numbers are hashed as floats so that e.g. initial_deer=10 and 10.0 share a key
+    for name, value in full.items():
+        if isinstance(value, numbers.Real) and not isinstance(value, bool):
+            full[name] = float(value)
+    return full
+
+
+class ResultStore:
+    """
+    A size-bounded store of DataCollector series and final summaries.
+
+    Each run is one compressed column file (one array per series). Reading an
+    entry refreshes its modification time, and the least recently used entries
+    are evicted once the store grows past max_bytes or max_entries.
+
+    Example:
+    >>> store = ResultStore("results_cache")
+    >>> result = store.run({"tree": True, "initial_deer": 10}, seed=42)
+    >>> result["summary"]["deer"], result["series"]["Deer"][-1]
+    """
+
+    def __init__(self, path="results_cache", max_bytes=512 * 1024 * 1024, max_entries=None):
+        """
+        Args:
+            path: Directory holding the stored runs
+            max_bytes: Total size the store may reach before evicting old runs
+            max_entries: Number of runs the store may hold, None for no limit
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.version = code_version()
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, params, seed, step_count):
+        """
+        Content hash identifying a run.
+        """
+        identity = {
+            "params": model_parameters(params),
+            "seed": seed,
+            "step_count": step_count,
+            "version": self.version,
+        }
+        text = json.dumps(identity, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".npz")
+
+    def get(self, key):
+        """
+        Returns the stored result for a key, or None if it is not in the store.
+
+        Entries removed by another worker, or left unreadable, count as misses.
+        """
+        path = self._file(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                series = {}
+                summary = {}
+                for name in data.files:
+                    if name.startswith(SUMMARY_PREFIX):
+                        summary[name[len(SUMMARY_PREFIX):]] = data[name].item()
+                    else:
+                        series[name] = data[name].tolist()
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return {"series": series, "summary": summary}
+
+    def put(self, key, series, summary):
+        """
+        Stores the DataCollector series and summary of a run under a key.
+        """
+        columns = {name: np.asarray(values) for name, values in series.items()}
+        for name, value in summary.items():
+            columns[SUMMARY_PREFIX + name] = np.asarray(value)
+
+        #Write to a temporary file first so readers never see a partial entry
+        path = self._file(key)
+        temp = path + ".%d.tmp" % os.getpid()
+        with open(temp, "wb") as f:
+            np.savez_compressed(f, **columns)
+        os.replace(temp, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes least recently used runs until the store is within its limits.
+
+        Temporary files of writes still in progress count towards max_bytes,
+        and ones older than STALE_TEMP_SECONDS are deleted. Files removed by
+        another worker while this runs are skipped.
+        """
+        entries = []
+        total = 0
+        stale = time.time() - STALE_TEMP_SECONDS
+        for name in os.listdir(self.path):
+            if not (name.endswith(".npz") or name.endswith(".tmp")):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.endswith(".tmp"):
+                if stat.st_mtime < stale:
+                    self._remove(path)
+                else:
+                    total += stat.st_size
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+        entries.sort()
+
+        while entries and (
+            total > self.max_bytes
+            or (self.max_entries is not None and len(entries) > self.max_entries)
+        ):
+            _, size, name = entries.pop(0)
+            self._remove(os.path.join(self.path, name))
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def run(self, params, seed=None, step_count=731):
+        """
+        Returns the result of running WolfDeer with the given parameters,
+        loading it from the store if the same run has been done before.
+
+        Runs without a seed are not reproducible and are never stored, nor are
+        runs given their own random streams, which the key cannot identify.
+        """
+        if seed is None or params.get("streams") is not None:
+            return self._compute(params, seed, step_count)
+
+        key = self.key(params, seed, step_count)
+        result = self.get(key)
+        if result is None:
+            result = self._compute(params, seed, step_count)
+            self.put(key, result["series"], result["summary"])
+        return result
+
+    def _compute(self, params, seed, step_count):
+        model = WolfDeer(seed=seed, **params)
+        for i in range(step_count):
+            if not model.running:
+                break
+            model.step()
+        model.close()
+        return {"series": model.datacollector.model_vars, "summary": model.summary()}
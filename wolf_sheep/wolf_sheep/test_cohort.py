@@ -0,0 +1,48 @@
+import math
+
+import pytest
+
+from .cohort import INITIAL_GROWN_TREES, INITIAL_JUVENILE_TREES, CohortModel, ensemble
+from .model import WolfDeer
+
+
+def check_counts(model):
+    assert (model.juvenile_count >= 0).all()
+    assert (model.juvenile_health >= -1e-6).all()
+    assert model.grown_count >= 0 and model.has_grown_count >= 0
+    assert (model.deer_energy >= 0).all()
+
+
+#Steps before the first fraying window, and a herd size large enough to graze heavily
+@pytest.mark.parametrize("initial_deer, step_count", [(40, 59), (0, 731)])
+def test_trees_are_conserved_without_fraying(initial_deer, step_count):
+    model = CohortModel(tree=True, initial_deer=initial_deer, tree_natural_mortality=0.001, seed=3)
+    for i in range(step_count):
+        model.step()
+        check_counts(model)
+
+    summary = model.summary()
+    assert summary["tree_antler_deaths"] == 0
+    assert summary["tree_natural_deaths"] > 0
+    if initial_deer:
+        assert summary["tree_eaten_deaths"] > 0
+    live = summary["grown_trees"] + summary["juvenile_trees"]
+    assert INITIAL_GROWN_TREES + INITIAL_JUVENILE_TREES == live + summary["tree_eaten_deaths"] + summary["tree_natural_deaths"]
+
+
+def test_deer_deaths_agree_with_agent_model(tmp_path, monkeypatch):
+    #Without trees every deer either starves within a few steps or dies of
+    #mortality or population control first, so both models must give the same
+    #distribution of death causes
+    monkeypatch.chdir(tmp_path)
+    params = dict(tree=False, initial_deer=40, width=10, height=10, deer_mortality=0.05, population_control=0.05)
+    seeds = range(30)
+    fast = ensemble(CohortModel, seeds, step_count=10, **params)
+    full = ensemble(WolfDeer, seeds, step_count=10, **params)
+
+    assert fast["deer"] == full["deer"] == (0.0, 0.0)
+    for name in ["deer_energy_deaths", "deer_mortality_deaths", "population_control_deaths"]:
+        (fast_mean, fast_std), (full_mean, full_std) = fast[name], full[name]
+        assert full_mean > 0
+        error = math.sqrt((fast_std ** 2 + full_std ** 2) / len(seeds))
+        assert abs(fast_mean - full_mean) < 4 * error, name
@@ -0,0 +1,61 @@
+"""
+Tests for the binary event log.
+"""
+
+import pytest
+
+from . import events
+from .events import EventLog, read_events
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "events.bin")
+    with EventLog(path, chunk_events=2) as log:
+        log.record(1, events.TREE_EATEN, (3, 4), 10)
+        log.record(2, events.DEER_BIRTH, (5, 6), 11, 7)
+        log.record(3, events.TREE_FRAYED, (0, 405), 12)
+
+    read = read_events(path)
+    assert read["step"].tolist() == [1, 2, 3]
+    assert read["kind"].tolist() == [events.TREE_EATEN, events.DEER_BIRTH, events.TREE_FRAYED]
+    assert read["x"].tolist() == [3, 5, 0]
+    assert read["y"].tolist() == [4, 6, 405]
+    assert read["agent_id"].tolist() == [10, 11, 12]
+    assert read["related_id"].tolist() == [-1, 7, -1]
+
+
+def test_empty_log(tmp_path):
+    path = str(tmp_path / "events.bin")
+    EventLog(path).close()
+    assert len(read_events(path)) == 0
+
+
+def test_not_an_event_log(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"something else")
+    with pytest.raises(ValueError):
+        read_events(str(path))
+
+
+def test_agent_without_position_is_rejected(tmp_path):
+    with EventLog(str(tmp_path / "events.bin")) as log:
+        with pytest.raises(TypeError):
+            log.record(1, events.TREE_EATEN, None, 10)
+
+
+def test_model_records_each_tree_death_once(tmp_path, planted_model):
+    #Low-health trees and many deer inside the fraying window, so that grazing
+    #and fraying both kill trees in the same steps
+    path = str(tmp_path / "events.bin")
+    with EventLog(path) as log:
+        model = planted_model(trees=600, size=40, health=300, initial_deer=10, seed=0, event_log=log)
+        model.schedule.steps = 59
+        for i in range(8):
+            model.step()
+
+    read = read_events(path)
+    assert (read["kind"] == events.TREE_EATEN).sum() > 0
+    assert (read["kind"] == events.TREE_FRAYED).sum() > 0
+    deaths = read[(read["kind"] == events.TREE_EATEN) | (read["kind"] == events.TREE_FRAYED) | (read["kind"] == events.TREE_NATURAL_DEATH)]
+    assert (read["x"] >= 0).all() and (read["y"] >= 0).all()
+    assert len(set(deaths["agent_id"].tolist())) == len(deaths)
@@ -0,0 +1,24 @@
+from .model import WolfDeer
+from .profiling import check_baseline
+
+
+def make_model():
+    return WolfDeer(tree=False, initial_deer=3, width=10, height=10, seed=1)
+
+
+def test_model_returns_to_baseline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    memory, stable = check_baseline(make_model, runs=6)
+    assert stable, memory
+
+
+def test_leaking_factory_is_detected(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    leaked = []
+
+    def make_leaking_model():
+        leaked.append(bytearray(200))
+        return make_model()
+
+    memory, stable = check_baseline(make_leaking_model, runs=6)
+    assert not stable, memory
@@ -0,0 +1,52 @@
+"""
+Tests for the per-subsystem random streams.
+"""
+
+import numpy as np
+
+from .cohort import CohortModel
+from .rng import RandomStreams
+
+
+def run_deer_model(planted_model, **params):
+    model = planted_model(initial_deer=3, deer_reproduce=0.2, **params)
+    for i in range(100):
+        model.step()
+    return model.datacollector.model_vars
+
+
+def test_same_seed_same_run(planted_model):
+    assert run_deer_model(planted_model, seed=5) == run_deer_model(planted_model, seed=5)
+    assert run_deer_model(planted_model, seed=5) != run_deer_model(planted_model, seed=6)
+
+
+def test_spawned_streams_drive_the_model(planted_model):
+    first, second = RandomStreams(5).spawn(2)
+    again = RandomStreams(5).spawn(2)[0]
+    assert run_deer_model(planted_model, streams=first) == run_deer_model(planted_model, streams=again)
+    assert run_deer_model(planted_model, streams=first) != run_deer_model(planted_model, streams=second)
+
+
+def test_streams_are_independent():
+    streams = RandomStreams(1)
+    grazing = [streams.random("grazing").random() for i in range(5)]
+
+    #Drawing from another subsystem first does not change the grazing draws
+    other = RandomStreams(1)
+    other.random("movement").random()
+    other.generator("movement").random(10)
+    assert [other.random("grazing").random() for i in range(5)] == grazing
+
+
+def test_spawned_streams_can_be_recreated():
+    child = RandomStreams(3).spawn(3)[2]
+    recreated = RandomStreams(np.random.SeedSequence(child.seed, spawn_key=child.spawn_key))
+    assert recreated.random("grazing").random() == child.random("grazing").random()
+
+
+def test_cohort_model_same_seed_same_run():
+    first = CohortModel(tree=True, seed=2)
+    first.run_model(200)
+    second = CohortModel(tree=True, seed=2)
+    second.run_model(200)
+    assert first.model_vars == second.model_vars
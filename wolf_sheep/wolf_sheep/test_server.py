@@ -0,0 +1,19 @@
+import importlib
+
+import mesa
+import pytest
+
+from . import server
+
+
+def test_import_does_not_build_server(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("ModularServer built on import")
+
+    monkeypatch.setattr(mesa.visualization, "ModularServer", fail)
+    module = importlib.reload(server)
+    assert module.model_params["tree"].value is True
+
+    #The server is only built when it is asked for
+    with pytest.raises(AssertionError):
+        module.server
@@ -0,0 +1,80 @@
+"""
+Tests for the ResultStore, using small deer-only runs.
+"""
+
+import os
+
+from .store import ResultStore
+
+PARAMS = {"tree": False, "width": 20, "height": 20}
+
+
+def test_hit_returns_stored_result(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ResultStore(str(tmp_path / "store"))
+    key = store.key(PARAMS, 1, 20)
+    assert store.get(key) is None
+
+    first = store.run(PARAMS, seed=1, step_count=20)
+    assert os.path.exists(store._file(key))
+    assert store.get(key) == first
+    assert store.run(PARAMS, seed=1, step_count=20) == first
+
+
+def test_key_ignores_number_type():
+    store = ResultStore.__new__(ResultStore)
+    store.version = "v"
+    assert store.key({"initial_deer": 10}, 1, 20) == store.key({"initial_deer": 10.0}, 1, 20)
+    assert store.key({"initial_deer": 10}, 1, 20) != store.key({"initial_deer": 11}, 1, 20)
+
+
+def test_corrupt_entry_is_a_miss(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ResultStore(str(tmp_path / "store"))
+    key = store.key(PARAMS, 1, 5)
+    with open(store._file(key), "wb") as f:
+        f.write(b"not a zip file")
+    assert store.get(key) is None
+    assert store.run(PARAMS, seed=1, step_count=5)["series"]["Deer"]
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ResultStore(str(tmp_path / "store"), max_entries=2)
+    keys = [store.key(PARAMS, seed, 5) for seed in (1, 2, 3)]
+
+    store.run(PARAMS, seed=1, step_count=5)
+    store.run(PARAMS, seed=2, step_count=5)
+    #Make seed 2 the oldest entry, then read seed 1 so it is the most recent
+    os.utime(store._file(keys[1]), (0, 0))
+    os.utime(store._file(keys[0]), (1, 1))
+    assert store.get(keys[0]) is not None
+
+    store.run(PARAMS, seed=3, step_count=5)
+    assert store.get(keys[0]) is not None
+    assert store.get(keys[1]) is None
+    assert store.get(keys[2]) is not None
+
+
+def test_stale_temporary_files_are_removed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ResultStore(str(tmp_path / "store"))
+    stale = os.path.join(store.path, "abc.npz.123.tmp")
+    fresh = os.path.join(store.path, "def.npz.456.tmp")
+    for path in (stale, fresh):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+    os.utime(stale, (0, 0))
+
+    store.evict()
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+
+def test_eviction_skips_files_removed_by_another_worker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ResultStore(str(tmp_path / "store"), max_entries=1)
+    store.run(PARAMS, seed=1, step_count=5)
+    listed = os.listdir(store.path) + ["gone.npz"]
+    monkeypatch.setattr(os, "listdir", lambda path: listed)
+    store.evict()